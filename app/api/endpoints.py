@@ -1,19 +1,38 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from fastapi_limiter import FastAPILimiter
+from fastapi_limiter.depends import WebSocketRateLimiter
 from typing import List
 import logging
+import os
 from datetime import datetime
 from ..schemas import (
     TokenizeRequest, TokenizeResponse, BatchTokenizeRequest,
-    StatisticsResponse, HealthCheckResponse
+    StatisticsResponse, HealthCheckResponse,
+    TokenizeSessionMessage, TokenDiffResponse,
+    FeatureExtractionRequest, FeatureExtractionResponse
 )
 from ..utils.multilang_processor import MultiLanguageProcessor
-from ..security.auth import get_current_active_user
+from ..utils.incremental_tokenizer import IncrementalTokenizer
+from ..utils.feature_extractor import FeatureExtractor
+from ..security.auth import get_current_active_user, get_current_user
+from ..models.base import engine
 from ..core.dependencies import rate_limit_dependency
 
 router = APIRouter()
+# WebSocket routes authenticate inside the handler, so they are mounted
+# without the bearer-header dependencies of the HTTP router
+ws_router = APIRouter()
 logger = logging.getLogger(__name__)
 text_processor = MultiLanguageProcessor()
 
+# Tokenize session limits
+SESSION_MAX_LENGTH = int(os.getenv("TOKENIZE_SESSION_MAX_LENGTH", "1000000"))
+SESSION_MAX_MESSAGE_SIZE = int(os.getenv("TOKENIZE_SESSION_MAX_MESSAGE_SIZE", "65536"))
+# Same budget as the HTTP endpoints, counted per session message
+session_rate_limiter = WebSocketRateLimiter(times=100, seconds=60)
+
 @router.post("/tokenize", response_model=TokenizeResponse)
 async def tokenize_text(
     request: TokenizeRequest,
@@ -70,6 +89,126 @@ async def batch_tokenize_text(
         logger.error(f"Batch tokenization error: {e}")
         raise HTTPException(status_code=500, detail=f"Batch processing error: {str(e)}")
 
+@router.post("/features", response_model=FeatureExtractionResponse)
+async def extract_features(
+    request: FeatureExtractionRequest,
+    user=Depends(get_current_active_user)
+):
+    """Build a sparse CSR term-document matrix from tokenized texts"""
+    try:
+        results = await text_processor.batch_tokenize(
+            texts=request.texts,
+            language=request.language,
+            remove_punctuation=request.remove_punctuation,
+            remove_stopwords=request.remove_stopwords
+        )
+        documents = [result["tokens"] for result in results]
+
+        if request.mode == "fit":
+            # A fitted state sent without a mode would otherwise be refitted silently
+            if request.vocabulary is not None or request.document_frequency is not None or request.n_documents:
+                raise ValueError("Mode 'fit' does not take a fitted state; use 'partial_fit' or 'transform'")
+            extractor = FeatureExtractor()
+        elif request.vocabulary is None:
+            raise ValueError(f"Mode '{request.mode}' requires a fitted vocabulary")
+        else:
+            extractor = FeatureExtractor(
+                vocabulary=request.vocabulary,
+                document_frequency=request.document_frequency,
+                n_documents=request.n_documents
+            )
+
+        if request.mode == "transform":
+            matrix = extractor.transform(documents, tfidf=request.tfidf, normalize=request.normalize)
+        else:
+            matrix = extractor.partial_fit_transform(documents, tfidf=request.tfidf, normalize=request.normalize)
+
+        return FeatureExtractionResponse(language=request.language, **matrix)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Feature extraction error: {e}")
+        raise HTTPException(status_code=500, detail=f"Feature extraction error: {str(e)}")
+
+async def receive_session_text(websocket: WebSocket) -> str:
+    """Receive a text frame, rejecting binary frames"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+    if message.get("text") is None:
+        raise ValueError("Messages must be JSON text frames")
+    return message["text"]
+
+@ws_router.websocket("/tokenize/ws")
+async def tokenize_session(
+    websocket: WebSocket,
+    language: str,
+    remove_punctuation: bool = True,
+    remove_stopwords: bool = False
+):
+    """Incrementally tokenize a growing or edited text, replying with token diffs"""
+    await websocket.accept()
+    try:
+        processor = text_processor.get_processor(language)
+    except ValueError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+
+    # The token comes in the first message rather than the URL, which
+    # would be written to the access log
+    try:
+        message = TokenizeSessionMessage.model_validate_json(await receive_session_text(websocket))
+        if message.op != "auth" or not message.token:
+            raise ValueError("First message must be an 'auth' message with a token")
+        with Session(engine) as db:
+            user = await get_current_user(token=message.token, db=db)
+        if not user.is_active:
+            raise HTTPException(status_code=400, detail="Inactive user")
+    except WebSocketDisconnect:
+        return
+    except (HTTPException, ValidationError, ValueError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Could not validate credentials")
+        return
+    except Exception as e:
+        logger.error(f"Tokenize session authentication error: {e}")
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+
+    session = IncrementalTokenizer(
+        processor, remove_punctuation, remove_stopwords, max_length=SESSION_MAX_LENGTH
+    )
+    try:
+        while True:
+            try:
+                data = await receive_session_text(websocket)
+                if len(data) > SESSION_MAX_MESSAGE_SIZE:
+                    raise ValueError(f"Message exceeds {SESSION_MAX_MESSAGE_SIZE} characters")
+                if FastAPILimiter.redis:
+                    await session_rate_limiter(websocket, context_key=str(user.id))
+                message = TokenizeSessionMessage.model_validate_json(data)
+                if message.op == "append":
+                    diff = await session.append(message.text)
+                elif message.op == "edit":
+                    if message.start is None or message.end is None:
+                        raise ValueError("Edit requires 'start' and 'end'")
+                    diff = await session.edit(message.start, message.end, message.text)
+                elif message.op == "reset":
+                    diff = await session.reset()
+                else:
+                    raise ValueError("Session is already authenticated")
+            except HTTPException as e:
+                await websocket.send_json({"type": "error", "detail": e.detail})
+                continue
+            except (ValidationError, ValueError) as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            await websocket.send_json({"type": "diff", **TokenDiffResponse(**diff).model_dump()})
+    except WebSocketDisconnect:
+        logger.info(f"Tokenize session closed for user {user.id}")
+    except Exception as e:
+        logger.error(f"Tokenize session error: {e}")
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+
 @router.post("/statistics", response_model=StatisticsResponse)
 async def get_text_statistics(
     request: TokenizeRequest,
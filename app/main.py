@@ -6,7 +6,7 @@ import logging
 import os
 from redis.asyncio import Redis
 from sqlalchemy.orm import Session
-from .api.endpoints import router as api_router
+from .api.endpoints import router as api_router, ws_router as api_ws_router
 from .api.auth import router as auth_router
 from .utils.multilang_processor import MultiLanguageProcessor
 from .models.base import init_db, engine
@@ -88,10 +88,11 @@ router_dependencies = [Depends(oauth2_scheme)]
 if rate_limit_dependency:
     router_dependencies.append(Depends(rate_limit_dependency))
 app.include_router(api_router, prefix="/api/v1", tags=["text-processing"], dependencies=router_dependencies)
+app.include_router(api_ws_router, prefix="/api/v1", tags=["text-processing"])
 
 # Log available routes
 for route in app.routes:
-    logger.info(f"Route: {route.path}, Methods: {route.methods}")
+    logger.info(f"Route: {route.path}, Methods: {getattr(route, 'methods', None)}")
 
 @app.get("/")
 async def root():
@@ -107,7 +108,9 @@ async def root():
             "text_processing": {
                 "tokenize": "/api/v1/tokenize",
                 "batch_tokenize": "/api/v1/tokenize/batch",
+                "tokenize_session": "/api/v1/tokenize/ws",
                 "statistics": "/api/v1/statistics",
+                "features": "/api/v1/features",
             },
             "health": "/health"
         }
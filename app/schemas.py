@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Literal
 from datetime import datetime
 
 # Authentication and User schemas
@@ -48,6 +48,26 @@ class BatchTokenizeRequest(BaseModel):
     remove_punctuation: bool = Field(True, description="Remove punctuation from tokens")
     remove_stopwords: bool = Field(False, description="Remove stopwords")
 
+class FeatureExtractionRequest(BatchTokenizeRequest):
+    mode: Literal["fit", "partial_fit", "transform"] = Field(
+        "fit", description="Fit a new vocabulary, extend the given one, or only transform with it"
+    )
+    tfidf: bool = Field(False, description="Weight term counts by inverse document frequency")
+    normalize: bool = Field(True, description="L2-normalize TF-IDF rows")
+    vocabulary: Optional[List[str]] = Field(None, description="Fitted vocabulary from a previous response")
+    document_frequency: Optional[List[int]] = Field(None, description="Fitted document frequencies from a previous response")
+    n_documents: int = Field(0, ge=0, description="Number of documents fitted so far")
+
+class FeatureExtractionResponse(BaseModel):
+    indptr: List[int]
+    indices: List[int]
+    data: List[float]
+    shape: List[int]
+    vocabulary: List[str]
+    document_frequency: Optional[List[int]] = None
+    n_documents: int
+    language: str
+
 class TokenizeResponse(BaseModel):
     original_text: str
     cleaned_text: str
@@ -59,6 +79,29 @@ class TokenizeResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class TokenizeSessionMessage(BaseModel):
+    op: Literal["auth", "append", "edit", "reset"] = Field(..., description="Operation to apply to the session text")
+    token: Optional[str] = Field(None, description="Access token, sent in the first 'auth' message")
+    text: str = Field("", description="Text to append or to insert over the edited range")
+    start: Optional[int] = Field(None, ge=0, description="Start offset of the edited range")
+    end: Optional[int] = Field(None, ge=0, description="End offset (exclusive) of the edited range")
+
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "op": "edit",
+            "text": "yakaungana",
+            "start": 10,
+            "end": 15
+        }
+    })
+
+class TokenDiffResponse(BaseModel):
+    version: int
+    start: int
+    delete: int
+    insert: List[str]
+    token_count: int
+
 class StatisticsResponse(BaseModel):
     statistics: Dict
     word_frequency: Dict[str, int]
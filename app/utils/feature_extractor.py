@@ -0,0 +1,120 @@
+from itertools import islice
+from typing import List, Dict, Optional
+import numpy as np
+
+class FeatureExtractor:
+    """Build sparse CSR term-document matrices from token lists.
+
+    Each token is turned into an integer term id once; all counting is then
+    done on whole-corpus int64 NumPy arrays.
+    The fitted state (vocabulary, document frequencies and document count)
+    can be passed back in to keep fitting a streaming corpus.
+    """
+
+    def __init__(self, vocabulary: Optional[List[str]] = None,
+                 document_frequency: Optional[List[int]] = None,
+                 n_documents: int = 0):
+        self.vocabulary: List[str] = list(vocabulary or [])
+        self.term_index: Dict[str, int] = {term: i for i, term in enumerate(self.vocabulary)}
+        if len(self.term_index) != len(self.vocabulary):
+            raise ValueError("vocabulary terms must be unique")
+        if n_documents < 0:
+            raise ValueError("n_documents must not be negative")
+
+        # Without document frequencies a given vocabulary can only be used
+        # to count terms
+        if document_frequency is None and not self.vocabulary:
+            document_frequency = []
+        if document_frequency is not None:
+            if len(document_frequency) != len(self.vocabulary):
+                raise ValueError("document_frequency must have one entry per vocabulary term")
+            if any(frequency < 0 or frequency > n_documents for frequency in document_frequency):
+                raise ValueError("document_frequency entries must be between 0 and n_documents")
+            document_frequency = np.asarray(document_frequency, dtype=np.int64)
+        self.document_frequency: Optional[np.ndarray] = document_frequency
+        self.n_documents = n_documents
+
+    def partial_fit(self, documents: List[List[str]]) -> "FeatureExtractor":
+        """Add the terms and document frequencies of a batch to the fitted state"""
+        self._count(documents, extend_vocabulary=True)
+        return self
+
+    def transform(self, documents: List[List[str]], tfidf: bool = False,
+                  normalize: bool = True) -> Dict:
+        """Build the CSR matrix of documents against the fitted vocabulary.
+        Terms missing from the vocabulary are ignored."""
+        if tfidf and self.document_frequency is None:
+            raise ValueError("TF-IDF weighting requires document_frequency")
+        indptr, indices, counts = self._count(documents, extend_vocabulary=False)
+        return self._to_matrix(indptr, indices, counts, tfidf, normalize)
+
+    def partial_fit_transform(self, documents: List[List[str]], tfidf: bool = False,
+                              normalize: bool = True) -> Dict:
+        """Update the fitted state with a batch and return its CSR matrix"""
+        indptr, indices, counts = self._count(documents, extend_vocabulary=True)
+        return self._to_matrix(indptr, indices, counts, tfidf, normalize)
+
+    def _count(self, documents: List[List[str]], extend_vocabulary: bool):
+        if extend_vocabulary and self.document_frequency is None:
+            raise ValueError("partial_fit requires document_frequency")
+
+        lengths = np.fromiter((len(doc) for doc in documents), dtype=np.int64, count=len(documents))
+        term_index = self.term_index
+        if extend_vocabulary:
+            known_terms = len(term_index)
+            token_ids = np.fromiter(
+                (term_index.setdefault(token, len(term_index)) for doc in documents for token in doc),
+                dtype=np.int64, count=int(lengths.sum())
+            )
+            if len(term_index) > known_terms:
+                self.vocabulary.extend(islice(term_index, known_terms, None))
+        else:
+            token_ids = np.fromiter(
+                (term_index.get(token, -1) for doc in documents for token in doc),
+                dtype=np.int64, count=int(lengths.sum())
+            )
+        doc_ids = np.repeat(np.arange(len(documents), dtype=np.int64), lengths)
+        if not extend_vocabulary:
+            known = token_ids >= 0
+            token_ids = token_ids[known]
+            doc_ids = doc_ids[known]
+
+        # One key per (document, term) pair; sorted unique keys give CSR order
+        n_terms = max(len(self.vocabulary), 1)
+        keys, counts = np.unique(doc_ids * n_terms + token_ids, return_counts=True)
+        rows = keys // n_terms
+        indices = keys % n_terms
+        indptr = np.zeros(len(documents) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(documents)), out=indptr[1:])
+
+        if extend_vocabulary:
+            document_frequency = np.zeros(len(self.vocabulary), dtype=np.int64)
+            document_frequency[:len(self.document_frequency)] = self.document_frequency
+            document_frequency += np.bincount(indices, minlength=len(self.vocabulary))
+            self.document_frequency = document_frequency
+            self.n_documents += len(documents)
+
+        return indptr, indices, counts
+
+    def _to_matrix(self, indptr: np.ndarray, indices: np.ndarray, counts: np.ndarray,
+                   tfidf: bool, normalize: bool) -> Dict:
+        data = counts.astype(np.float64)
+        if tfidf:
+            # Smoothed idf, as if one extra document contained every term
+            idf = np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+            data *= idf[indices]
+            if normalize:
+                rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+                norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=len(indptr) - 1))
+                data /= norms[rows]
+
+        return {
+            "indptr": indptr.tolist(),
+            "indices": indices.tolist(),
+            "data": data.tolist(),
+            "shape": [len(indptr) - 1, len(self.vocabulary)],
+            "vocabulary": list(self.vocabulary),
+            "document_frequency": (self.document_frequency.tolist()
+                                   if self.document_frequency is not None else None),
+            "n_documents": self.n_documents
+        }
@@ -0,0 +1,219 @@
+import re
+from typing import List, Dict, Optional
+
+# Every cleaning and tokenizing rule in the language processors works
+# within a whitespace-delimited chunk, so any run of whole chunks can be
+# re-tokenized on its own and give the same tokens as the whole text would.
+WHITESPACE_PATTERN = re.compile(r'\s')
+
+# Target number of characters per block of the session text
+BLOCK_SIZE = 4096
+# Target number of characters tokenized in one processor call
+SEGMENT_SIZE = 512
+
+class TextBlock:
+    """A run of whole chunks of the session text and their tokens.
+    The text is split into segments, each tokenized in one call and
+    stored as a [length, token count] pair."""
+
+    __slots__ = ("text", "tokens", "segments")
+
+    def __init__(self, text: str = "", tokens: Optional[List[str]] = None,
+                 segments: Optional[List[List[int]]] = None):
+        self.text = text
+        self.tokens = tokens or []
+        self.segments = segments or []
+
+class IncrementalTokenizer:
+    """Keep tokenizer state for a growing or edited document.
+
+    The text is stored as blocks of about block_size characters, each made
+    of segments of about segment_size characters. Every block and segment
+    except the last ends with whitespace, so no chunk spans two of them.
+    An edit only rebuilds the blocks it touches and re-tokenizes the
+    segments it changes, then returns a token diff that the client applies
+    as ``tokens[start:start + delete] = insert``.
+    """
+
+    def __init__(self, processor, remove_punctuation: bool = True,
+                 remove_stopwords: bool = False, max_length: Optional[int] = None,
+                 block_size: int = BLOCK_SIZE, segment_size: int = SEGMENT_SIZE):
+        self.processor = processor
+        self.remove_punctuation = remove_punctuation
+        self.remove_stopwords = remove_stopwords
+        self.max_length = max_length
+        self.block_size = block_size
+        self.segment_size = segment_size
+        self.blocks: List[TextBlock] = [TextBlock()]
+        self.length = 0
+        self.token_count = 0
+        self.version = 0
+
+    @property
+    def text(self) -> str:
+        return "".join(block.text for block in self.blocks)
+
+    @property
+    def tokens(self) -> List[str]:
+        return [token for block in self.blocks for token in block.tokens]
+
+    async def append(self, text: str) -> Dict:
+        """Append text to the end of the document"""
+        return await self.edit(self.length, self.length, text)
+
+    async def edit(self, start: int, end: int, text: str) -> Dict:
+        """Replace the text between start and end with text and return the token diff"""
+        if not 0 <= start <= end <= self.length:
+            raise ValueError(f"Invalid edit range [{start}, {end}) for text of length {self.length}")
+        shift = len(text) - (end - start)
+        if self.max_length is not None and self.length + shift > self.max_length:
+            raise ValueError(f"Session text would exceed {self.max_length} characters")
+
+        # Gather the blocks covering the edited range
+        first_block, block_start, token_start = self._locate(start)
+        last_block = first_block
+        region_end = block_start + len(self.blocks[first_block].text)
+        while end > region_end:
+            last_block += 1
+            region_end += len(self.blocks[last_block].text)
+        region = self.blocks[first_block:last_block + 1]
+        old_text = "".join(block.text for block in region)
+        local_start = start - block_start
+        local_end = end - block_start
+        new_text = old_text[:local_start] + text + old_text[local_end:]
+
+        # Take in following blocks while the edited text could run into them,
+        # or to merge a block that has shrunk
+        while last_block + 1 < len(self.blocks) and (
+            not new_text[-1:].isspace() or len(new_text) < self.block_size // 2
+        ):
+            last_block += 1
+            region.append(self.blocks[last_block])
+            old_text += self.blocks[last_block].text
+            new_text += self.blocks[last_block].text
+
+        old_tokens = [token for block in region for token in block.tokens]
+        segments = [segment for block in region for segment in block.segments]
+        segment_starts = []
+        token_starts = []
+        position = token_position = 0
+        for length, count in segments:
+            segment_starts.append(position)
+            token_starts.append(token_position)
+            position += length
+            token_position += count
+
+        # Re-tokenize the segments holding the edited range. A segment ending
+        # exactly at the edit is kept if it ends with whitespace; the last
+        # segment of the text may not, and then the edit can extend its chunk.
+        first = 0
+        while first < len(segments) and (
+            segment_starts[first] + segments[first][0] < local_start
+            or (segment_starts[first] + segments[first][0] == local_start
+                and old_text[local_start - 1].isspace())
+        ):
+            first += 1
+        last = first
+        while last < len(segments) and segment_starts[last] <= local_end:
+            last += 1
+
+        if first < last:
+            window_start = segment_starts[first]
+            window_end = segment_starts[last - 1] + segments[last - 1][0] + shift
+            replace_start = token_starts[first]
+        else:
+            window_start = local_start
+            window_end = local_start + len(text)
+            replace_start = len(old_tokens)
+        replace_end = token_starts[last] if last < len(segments) else len(old_tokens)
+
+        window_tokens = []
+        window_segments = []
+        position = window_start
+        while position < window_end:
+            cut = window_end
+            if window_end - position > self.segment_size:
+                match = WHITESPACE_PATTERN.search(new_text, position + self.segment_size - 1, window_end)
+                if match:
+                    cut = match.end()
+            segment_tokens = await self.processor.tokenize(
+                new_text[position:cut], self.remove_punctuation, self.remove_stopwords
+            )
+            window_tokens.extend(segment_tokens)
+            window_segments.append([cut - position, len(segment_tokens)])
+            position = cut
+
+        replaced = old_tokens[replace_start:replace_end]
+        new_tokens = old_tokens[:replace_start] + window_tokens + old_tokens[replace_end:]
+        new_segments = segments[:first] + window_segments + segments[last:]
+
+        self.blocks[first_block:last_block + 1] = self._split(new_text, new_tokens, new_segments)
+        self.length += shift
+        self.token_count += len(window_tokens) - len(replaced)
+        self.version += 1
+
+        return self._diff(token_start + replace_start, replaced, window_tokens)
+
+    async def reset(self) -> Dict:
+        """Clear the document"""
+        return await self.edit(0, self.length, "")
+
+    def _locate(self, position: int):
+        """Return the index, start offset and first token index of the block
+        containing position"""
+        last_block = self.blocks[-1]
+        if position >= self.length - len(last_block.text):
+            # Appends and edits near the end never scan the earlier blocks
+            return (len(self.blocks) - 1, self.length - len(last_block.text),
+                    self.token_count - len(last_block.tokens))
+
+        block_start = token_start = 0
+        for index, block in enumerate(self.blocks):
+            if position < block_start + len(block.text):
+                return index, block_start, token_start
+            block_start += len(block.text)
+            token_start += len(block.tokens)
+
+    def _split(self, text: str, tokens: List[str], segments: List[List[int]]) -> List[TextBlock]:
+        """Group segments into blocks of at least block_size characters"""
+        blocks = []
+        position = token_position = 0
+        block_segments = []
+        block_length = block_tokens = 0
+        for segment in segments:
+            block_segments.append(segment)
+            block_length += segment[0]
+            block_tokens += segment[1]
+            if block_length >= self.block_size:
+                blocks.append(TextBlock(
+                    text[position:position + block_length],
+                    tokens[token_position:token_position + block_tokens],
+                    block_segments
+                ))
+                position += block_length
+                token_position += block_tokens
+                block_segments = []
+                block_length = block_tokens = 0
+
+        if block_segments or not blocks:
+            blocks.append(TextBlock(text[position:], tokens[token_position:], block_segments))
+        return blocks
+
+    def _diff(self, first: int, old_tokens: List[str], new_tokens: List[str]) -> Dict:
+        """Trim the tokens shared by both ends of the replaced range"""
+        prefix = 0
+        limit = min(len(old_tokens), len(new_tokens))
+        while prefix < limit and old_tokens[prefix] == new_tokens[prefix]:
+            prefix += 1
+        suffix = 0
+        limit -= prefix
+        while suffix < limit and old_tokens[-1 - suffix] == new_tokens[-1 - suffix]:
+            suffix += 1
+
+        return {
+            "version": self.version,
+            "start": first + prefix,
+            "delete": len(old_tokens) - prefix - suffix,
+            "insert": new_tokens[prefix:len(new_tokens) - suffix],
+            "token_count": self.token_count
+        }
@@ -0,0 +1,224 @@
+"""Read-only, memory-mapped language resources shared by all workers.
+
+Build the pack from the processor definitions with:
+
+    python -m app.utils.language_pack language_pack.bin
+
+Every worker maps the same file, so the tables live once in the OS page
+cache instead of once per worker. Each entry records a fingerprint of the
+definitions module it was built from; checking it hashes that source file
+without importing the definitions.
+
+Layout (little-endian):
+    header      magic, format version, number of languages
+    directory   per language: offset/length of the code and the special
+                characters, offset/size/term count of the stopword table
+                and the fingerprint of the definitions module
+    stopwords   open-addressing hash table of (crc32, length, offset)
+                slots with linear probing, followed by the UTF-8 terms
+"""
+import argparse
+import hashlib
+import importlib
+import importlib.util
+import logging
+import mmap
+import os
+import struct
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from zlib import crc32
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MSLP"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sII")
+DIRECTORY_ENTRY = struct.Struct("<QQQQQQQ32s")
+SLOT = struct.Struct("<IIQ")
+
+# Lookups remembered per table; bounded so worker memory stays flat
+LOOKUP_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=None)
+def definitions_fingerprint(module_name: str) -> bytes:
+    """Hash of the source file of a resource definitions module"""
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or not spec.origin:
+        raise ValueError(f"Resource module '{module_name}' not found")
+    with open(spec.origin, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+def table_capacity(count: int) -> int:
+    """Power-of-two slot count keeping a table at most half full"""
+    capacity = 1
+    while capacity < 2 * count:
+        capacity *= 2
+    return capacity
+
+class MappedStringSet:
+    """Hashed set of strings read directly from the mapped file"""
+
+    def __init__(self, buffer, offset: int, count: int, capacity: int):
+        self._buffer = buffer
+        self._table = offset
+        self._count = count
+        self._mask = capacity - 1
+        self._data = offset + SLOT.size * capacity
+        # Token frequencies are skewed, so a small cache answers most lookups
+        self._cache: Dict[str, bool] = {}
+
+    def __contains__(self, value) -> bool:
+        found = self._cache.get(value)
+        if found is None:
+            found = self._lookup(value)
+            if len(self._cache) >= LOOKUP_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[value] = found
+        return found
+
+    def _lookup(self, value) -> bool:
+        if not isinstance(value, str):
+            return False
+        key = value.encode("utf-8")
+        key_hash = crc32(key)
+        index = key_hash & self._mask
+        while True:
+            slot_hash, length, offset = SLOT.unpack_from(self._buffer, self._table + SLOT.size * index)
+            if not length:
+                return False
+            # Only a matching hash costs a comparison of the stored term
+            if slot_hash == key_hash and length == len(key):
+                start = self._data + offset
+                if self._buffer[start:start + length] == key:
+                    return True
+            index = (index + 1) & self._mask
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._mask + 1):
+            _, length, offset = SLOT.unpack_from(self._buffer, self._table + SLOT.size * index)
+            if length:
+                start = self._data + offset
+                yield self._buffer[start:start + length].decode("utf-8")
+
+class LanguageResources:
+    """Resources of one language in a pack"""
+
+    def __init__(self, special_chars: str, stopwords, fingerprint: bytes):
+        self.special_chars = special_chars
+        self.stopwords = stopwords
+        self.fingerprint = fingerprint
+
+class LanguagePack:
+    """Memory-mapped view of a language pack file"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._buffer)
+
+        def check_range(offset: int, length: int) -> None:
+            if offset + length > size:
+                raise ValueError(f"Language pack '{path}' is truncated or corrupt")
+
+        check_range(0, HEADER.size)
+        magic, version, count = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a language pack")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Language pack version {version} is not supported, expected {FORMAT_VERSION}")
+        check_range(HEADER.size, DIRECTORY_ENTRY.size * count)
+
+        self.languages: Dict[str, LanguageResources] = {}
+        for index in range(count):
+            (code_offset, code_length, chars_offset, chars_length, stopwords_offset,
+             stopwords_size, stopwords_count, fingerprint) = DIRECTORY_ENTRY.unpack_from(
+                self._buffer, HEADER.size + DIRECTORY_ENTRY.size * index
+            )
+            capacity = table_capacity(stopwords_count)
+            check_range(code_offset, code_length)
+            check_range(chars_offset, chars_length)
+            check_range(stopwords_offset, stopwords_size)
+            if stopwords_size < SLOT.size * capacity:
+                raise ValueError(f"Language pack '{path}' is truncated or corrupt")
+
+            code = self._buffer[code_offset:code_offset + code_length].decode("utf-8")
+            special_chars = self._buffer[chars_offset:chars_offset + chars_length].decode("utf-8")
+            self.languages[code] = LanguageResources(
+                special_chars,
+                MappedStringSet(self._buffer, stopwords_offset, stopwords_count, capacity),
+                fingerprint
+            )
+
+    def get(self, language: str) -> Optional[LanguageResources]:
+        return self.languages.get(language)
+
+@lru_cache(maxsize=None)
+def load_language_pack(path: str) -> LanguagePack:
+    """Map a language pack once per process"""
+    return LanguagePack(path)
+
+def build_stopword_table(stopwords: Iterable[str]) -> Tuple[bytes, int]:
+    """Encode stopwords as a hash table followed by the UTF-8 terms,
+    returning the table and the number of terms"""
+    terms = sorted({term.encode("utf-8") for term in stopwords if term})
+    capacity = table_capacity(len(terms))
+    slots = [(0, 0, 0)] * capacity
+    data = bytearray()
+    for term in terms:
+        term_hash = crc32(term)
+        index = term_hash & (capacity - 1)
+        while slots[index][1]:
+            index = (index + 1) & (capacity - 1)
+        slots[index] = (term_hash, len(term), len(data))
+        data += term
+    return b"".join(SLOT.pack(*slot) for slot in slots) + bytes(data), len(terms)
+
+def build_language_pack(path: str, processor_classes: Dict) -> None:
+    """Write the resources each processor class defines in its
+    RESOURCES_MODULE to a pack"""
+    directory_size = HEADER.size + DIRECTORY_ENTRY.size * len(processor_classes)
+    body = bytearray()
+    entries = []
+    for code, processor_class in processor_classes.items():
+        definitions = importlib.import_module(processor_class.RESOURCES_MODULE)
+        code_bytes = code.encode("utf-8")
+        chars_bytes = definitions.SPECIAL_CHARS.encode("utf-8")
+        table, count = build_stopword_table(definitions.STOPWORDS)
+
+        code_offset = directory_size + len(body)
+        body += code_bytes
+        chars_offset = directory_size + len(body)
+        body += chars_bytes
+        # Align tables to their slot size
+        body += bytes(-(directory_size + len(body)) % SLOT.size)
+        stopwords_offset = directory_size + len(body)
+        body += table
+
+        entries.append((code_offset, len(code_bytes), chars_offset, len(chars_bytes),
+                        stopwords_offset, len(table), count,
+                        definitions_fingerprint(processor_class.RESOURCES_MODULE)))
+
+    # Write to a temporary file and rename it, so running workers keep
+    # their mapping of the previous pack intact
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(entries)))
+        for entry in entries:
+            f.write(DIRECTORY_ENTRY.pack(*entry))
+        f.write(body)
+    os.replace(temporary_path, path)
+
+if __name__ == "__main__":
+    from app.utils.multilang_processor import PROCESSOR_CLASSES
+
+    parser = argparse.ArgumentParser(description="Build the memory-mapped language pack")
+    parser.add_argument("output", help="Path of the language pack file to write")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    build_language_pack(args.output, PROCESSOR_CLASSES)
+    logger.info(f"Wrote language pack for {list(PROCESSOR_CLASSES.keys())} to {args.output}")
@@ -1,13 +1,51 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
+import logging
+import os
 from langdetect import detect
 from app.utils.shona_processor import ShonaTextProcessor
+from app.utils.language_pack import load_language_pack, definitions_fingerprint
+
+logger = logging.getLogger(__name__)
+
+PROCESSOR_CLASSES = {
+    'sn': ShonaTextProcessor,  # 'sn' is the ISO 639-1 code for Shona
+    # Add more language processors as needed
+}
 
 class MultiLanguageProcessor:
-    def __init__(self):
+    def __init__(self, language_pack_path: Optional[str] = None):
+        """
+        Create the language processors.
+        Resources are read from the memory-mapped language pack at
+        language_pack_path (default: LANGUAGE_PACK_PATH) when it exists,
+        otherwise from the built-in processor definitions.
+        """
+        if language_pack_path is None:
+            language_pack_path = os.getenv("LANGUAGE_PACK_PATH", "")
+        
+        pack = None
+        if language_pack_path:
+            try:
+                pack = load_language_pack(language_pack_path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Language pack unavailable, using built-in resources: {e}")
+        
         self.processors = {
-            'sn': ShonaTextProcessor(),  # 'sn' is the ISO 639-1 code for Shona
-            # Add more language processors as needed
+            language: processor_class(self._pack_resources(pack, language, processor_class))
+            for language, processor_class in PROCESSOR_CLASSES.items()
         }
+    
+    @staticmethod
+    def _pack_resources(pack, language: str, processor_class):
+        """Get the resources of a language from the pack, unless the pack
+        was built from other definitions than the processor's"""
+        resources = pack.get(language) if pack else None
+        if resources is None:
+            return None
+        if resources.fingerprint != definitions_fingerprint(processor_class.RESOURCES_MODULE):
+            logger.warning(f"Language pack entry for '{language}' is stale, using built-in resources")
+            return None
+        return resources
         
     def detect_language(self, text: str) -> str:
         """Detect the language of the input text."""
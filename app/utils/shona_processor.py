@@ -1,24 +1,25 @@
 import re
 from collections import Counter
+from importlib import import_module
 from typing import List, Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ShonaTextProcessor:
-    def __init__(self):
-        self.shona_special_chars = 'âêîôûḓṱṅṋ'
+    # Module with the built-in resources, imported only when no language
+    # pack provides them
+    RESOURCES_MODULE = 'app.utils.shona_resources'
+    
+    def __init__(self, resources=None):
+        if resources is not None:
+            special_chars, stopwords = resources.special_chars, resources.stopwords
+        else:
+            definitions = import_module(self.RESOURCES_MODULE)
+            special_chars, stopwords = definitions.SPECIAL_CHARS, definitions.STOPWORDS
+        self.shona_special_chars = special_chars
         self.shona_vowels = 'aeiou' + self.shona_special_chars
-        
-        # Extended Shona stopwords
-        self.shona_stopwords = {
-            'ne', 'na', 'ku', 'kwa', 'pa', 'mu', 'ma', 'aka', 'va', 'cha', 'zva',
-            'uye', 'asi', 'kana', 'nekuti', 'zvakare', 'zvakadaro', 'saka', 'iri',
-            'ndi', 'che', 'vo', 'zvake', 'kwavo', 'kwake', 'kwedu', 'kwenyu', 'kwecho',
-            'pano', 'apo', 'uko', 'uno', 'iyi', 'iyo', 'ichi', 'icho', 'zviri', 'zvine',
-            'zvino', 'zvose', 'ose', 'oga', 'ogaoga', 'zvisinei', 'chete', 'chaizvo',
-            'zvakanyanya', 'zvakare', 'zvakadaro'
-        }
+        self.shona_stopwords = stopwords
     
     async def clean_text(self, text: str) -> str:
         """Clean Shona text by removing unwanted characters"""
@@ -90,7 +91,4 @@ class ShonaTextProcessor:
         for text in texts:
             tokens = await self.tokenize(text, **kwargs)
             results.append(tokens)
-        return results
-
-# Global instance
-shona_processor = ShonaTextProcessor()
\ No newline at end of file
+        return results
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""Built-in Shona language resources.
+
+Language packs are built from these definitions, and processors only
+import this module when no up-to-date pack provides them.
+"""
+
+SPECIAL_CHARS = 'âêîôûḓṱṅṋ'
+
+# Extended Shona stopwords
+STOPWORDS = frozenset({
+    'ne', 'na', 'ku', 'kwa', 'pa', 'mu', 'ma', 'aka', 'va', 'cha', 'zva',
+    'uye', 'asi', 'kana', 'nekuti', 'zvakare', 'zvakadaro', 'saka', 'iri',
+    'ndi', 'che', 'vo', 'zvake', 'kwavo', 'kwake', 'kwedu', 'kwenyu', 'kwecho',
+    'pano', 'apo', 'uko', 'uno', 'iyi', 'iyo', 'ichi', 'icho', 'zviri', 'zvine',
+    'zvino', 'zvose', 'ose', 'oga', 'ogaoga', 'zvisinei', 'chete', 'chaizvo',
+    'zvakanyanya', 'zvakare', 'zvakadaro'
+})
@@ -0,0 +1,37 @@
+"""Compare stopword removal with built-in and language pack resources.
+
+Run from the repository root:
+
+    python benchmarks/language_pack_tokenize.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.shona_processor import ShonaTextProcessor
+from app.utils.multilang_processor import PROCESSOR_CLASSES
+from app.utils.language_pack import LanguagePack, build_language_pack
+
+TEXT = "Mhuri yese yakaungana pamba pavakuru, asi vana vaitamba panze na baba. " * 2000
+
+def best_time(processor, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        asyncio.run(processor.tokenize(TEXT, remove_stopwords=True))
+        best = min(best, time.perf_counter() - started)
+    return best
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "language_pack.bin")
+        build_language_pack(path, PROCESSOR_CLASSES)
+        built_in = best_time(ShonaTextProcessor())
+        packed = best_time(ShonaTextProcessor(LanguagePack(path).get("sn")))
+    print(f"{len(TEXT)} characters")
+    print(f"built-in resources: {built_in:.4f}s")
+    print(f"language pack:      {packed:.4f}s ({packed / built_in:.2f}x)")
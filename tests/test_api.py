@@ -1,6 +1,9 @@
 import pytest
 from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
 from app.main import app
+from app.api import endpoints
+from app.security.auth import get_current_active_user
 
 client = TestClient(app)
 
@@ -40,4 +43,129 @@ def test_batch_tokenize():
     assert response.status_code == 200
     data = response.json()
     assert "results" in data
-    assert len(data["results"]) == 2
\ No newline at end of file
+    assert len(data["results"]) == 2
+
+class FakeUser:
+    id = 1
+    is_active = True
+
+async def fake_get_current_user(token, db):
+    return FakeUser()
+
+def test_tokenize_session(monkeypatch):
+    monkeypatch.setattr(endpoints, "get_current_user", fake_get_current_user)
+    with client.websocket_connect("/api/v1/tokenize/ws?language=sn") as websocket:
+        websocket.send_json({"op": "auth", "token": "test-token"})
+        websocket.send_json({"op": "append", "text": "Mhuri yese yaka"})
+        assert websocket.receive_json()["insert"] == ["mhuri", "yese", "yaka"]
+        websocket.send_json({"op": "append", "text": "ungana"})
+        diff = websocket.receive_json()
+        assert diff["type"] == "diff"
+        assert diff["start"] == 2
+        assert diff["insert"] == ["yakaungana"]
+
+def test_tokenize_session_reports_bad_messages(monkeypatch):
+    monkeypatch.setattr(endpoints, "get_current_user", fake_get_current_user)
+    with client.websocket_connect("/api/v1/tokenize/ws?language=sn") as websocket:
+        websocket.send_json({"op": "auth", "token": "test-token"})
+        websocket.send_text("not json")
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_bytes(b"\x00")
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_json({"op": "edit", "start": 5, "end": 1})
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_text("x" * (endpoints.SESSION_MAX_MESSAGE_SIZE + 1))
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_json({"op": "append", "text": "Mhuri"})
+        assert websocket.receive_json()["insert"] == ["mhuri"]
+
+def test_tokenize_session_requires_auth_message():
+    with client.websocket_connect("/api/v1/tokenize/ws?language=sn") as websocket:
+        websocket.send_json({"op": "append", "text": "Mhuri"})
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            websocket.receive_json()
+        assert exc_info.value.code == 1008
+
+def test_tokenize_session_closes_on_processor_error(monkeypatch):
+    async def failing_tokenize(*args, **kwargs):
+        raise RuntimeError("processor failure")
+    monkeypatch.setattr(endpoints, "get_current_user", fake_get_current_user)
+    monkeypatch.setattr(endpoints.text_processor.get_processor("sn"), "tokenize", failing_tokenize)
+    with client.websocket_connect("/api/v1/tokenize/ws?language=sn") as websocket:
+        websocket.send_json({"op": "auth", "token": "test-token"})
+        websocket.send_json({"op": "append", "text": "Mhuri"})
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            websocket.receive_json()
+        assert exc_info.value.code == 1011
+
+@pytest.fixture
+def authorized():
+    app.dependency_overrides[get_current_active_user] = lambda: FakeUser()
+    yield {"Authorization": "Bearer test-token"}
+    app.dependency_overrides.clear()
+
+def test_features_fit(authorized):
+    test_data = {
+        "texts": ["Mhuri yese yakaungana.", "Vana vaitamba panze.", ""],
+        "language": "sn",
+        "tfidf": True
+    }
+    response = client.post("/api/v1/features", json=test_data, headers=authorized)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["shape"] == [3, 6]
+    assert data["indptr"] == [0, 3, 6, 6]
+    assert sorted(data["vocabulary"]) == sorted(["mhuri", "yese", "yakaungana", "vana", "vaitamba", "panze"])
+    assert data["document_frequency"] == [1] * 6
+    assert data["n_documents"] == 3
+
+def test_features_partial_fit_and_transform(authorized):
+    fitted = client.post("/api/v1/features", json={
+        "texts": ["Mhuri yese yakaungana."], "language": "sn"
+    }, headers=authorized).json()
+    state = {key: fitted[key] for key in ("vocabulary", "document_frequency", "n_documents")}
+
+    response = client.post("/api/v1/features", json={
+        "texts": ["Mhuri yese", "Vana vaitamba"], "language": "sn", "mode": "partial_fit", **state
+    }, headers=authorized)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["vocabulary"][:3] == fitted["vocabulary"]
+    assert data["n_documents"] == 3
+    assert data["document_frequency"][fitted["vocabulary"].index("mhuri")] == 2
+
+    response = client.post("/api/v1/features", json={
+        "texts": ["Mhuri vana"], "language": "sn", "mode": "transform", "tfidf": True, **state
+    }, headers=authorized)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["indices"] == [fitted["vocabulary"].index("mhuri")]
+    assert data["data"] == [1.0]
+    assert data["n_documents"] == 1
+
+def test_features_requires_vocabulary(authorized):
+    for mode in ("partial_fit", "transform"):
+        response = client.post("/api/v1/features", json={
+            "texts": ["Mhuri yese"], "language": "sn", "mode": mode
+        }, headers=authorized)
+        assert response.status_code == 400
+
+def test_features_fit_rejects_fitted_state(authorized):
+    response = client.post("/api/v1/features", json={
+        "texts": ["Mhuri yese"], "language": "sn",
+        "vocabulary": ["mhuri", "yese"], "document_frequency": [1, 1], "n_documents": 1
+    }, headers=authorized)
+    assert response.status_code == 400
+
+def test_features_rejects_invalid_state(authorized):
+    response = client.post("/api/v1/features", json={
+        "texts": ["Mhuri yese"], "language": "sn", "mode": "transform", "tfidf": True,
+        "vocabulary": ["mhuri", "yese"], "document_frequency": [5, 1]
+    }, headers=authorized)
+    assert response.status_code == 400
+
+def test_features_unsupported_language(authorized):
+    response = client.post("/api/v1/features", json={
+        "texts": ["Hello world"], "language": "xx"
+    }, headers=authorized)
+    assert response.status_code == 400
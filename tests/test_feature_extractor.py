@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from app.utils.feature_extractor import FeatureExtractor
+
+documents = [
+    ["mhuri", "yese", "mhuri"],
+    [],
+    ["vana", "yese"]
+]
+
+def dense(matrix):
+    rows, cols = matrix["shape"]
+    result = np.zeros((rows, cols))
+    for row in range(rows):
+        start, end = matrix["indptr"][row], matrix["indptr"][row + 1]
+        result[row, matrix["indices"][start:end]] = matrix["data"][start:end]
+    return result
+
+def test_counts_match_token_lists():
+    matrix = FeatureExtractor().partial_fit_transform(documents)
+    vocabulary = matrix["vocabulary"]
+    expected = np.array([[doc.count(term) for term in vocabulary] for doc in documents])
+    assert np.array_equal(dense(matrix), expected)
+    assert vocabulary == ["mhuri", "yese", "vana"]
+    assert matrix["document_frequency"] == [1, 2, 1]
+    assert matrix["n_documents"] == 3
+
+def test_tfidf_rows_are_normalized():
+    matrix = FeatureExtractor().partial_fit_transform(documents, tfidf=True)
+    norms = np.linalg.norm(dense(matrix), axis=1)
+    assert np.allclose(norms, [1.0, 0.0, 1.0])
+
+def test_partial_fit_matches_single_fit():
+    first = FeatureExtractor().partial_fit_transform(documents[:2])
+    extractor = FeatureExtractor(first["vocabulary"], first["document_frequency"], first["n_documents"])
+    extractor.partial_fit(documents[2:])
+    full = FeatureExtractor().partial_fit(documents)
+    assert sorted(extractor.vocabulary) == sorted(full.vocabulary)
+    assert extractor.n_documents == full.n_documents
+    for term in full.vocabulary:
+        assert (extractor.document_frequency[extractor.term_index[term]]
+                == full.document_frequency[full.term_index[term]])
+
+def test_transform_ignores_unknown_terms():
+    extractor = FeatureExtractor().partial_fit([["mhuri"]])
+    matrix = extractor.transform([["mhuri", "vana"]])
+    assert matrix["indices"] == [0]
+    assert matrix["data"] == [1.0]
+    assert matrix["n_documents"] == 1
+
+def test_document_frequency_must_match_vocabulary():
+    with pytest.raises(ValueError):
+        FeatureExtractor(["mhuri"], [1, 2])
+
+def test_rejects_document_frequency_above_document_count():
+    with pytest.raises(ValueError):
+        FeatureExtractor(["mhuri", "vana"], [5, 1])
+
+def test_rejects_duplicate_vocabulary():
+    with pytest.raises(ValueError):
+        FeatureExtractor(["mhuri", "mhuri"], [0, 1], n_documents=1)
+
+def test_tfidf_requires_document_frequency():
+    extractor = FeatureExtractor(["mhuri"])
+    assert extractor.transform([["mhuri"]])["data"] == [1.0]
+    with pytest.raises(ValueError):
+        extractor.transform([["mhuri"]], tfidf=True)
+    with pytest.raises(ValueError):
+        extractor.partial_fit([["mhuri"]])
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from app.utils.shona_processor import ShonaTextProcessor
+from app.utils.incremental_tokenizer import IncrementalTokenizer
+
+processor = ShonaTextProcessor()
+
+def apply_diff(tokens, diff):
+    tokens[diff["start"]:diff["start"] + diff["delete"]] = diff["insert"]
+    return tokens
+
+def test_append_matches_stateless_tokenize():
+    async def run():
+        session = IncrementalTokenizer(processor)
+        tokens = []
+        for part in ["Mhuri ye", "se yakau", "ngana pamba", " pavakuru."]:
+            tokens = apply_diff(tokens, await session.append(part))
+        expected = await processor.tokenize("Mhuri yese yakaungana pamba pavakuru.")
+        assert session.tokens == tokens == expected
+    asyncio.run(run())
+
+def test_append_only_sends_changed_tokens():
+    async def run():
+        session = IncrementalTokenizer(processor)
+        await session.append("Mhuri yese yaka")
+        diff = await session.append("ungana")
+        assert diff["start"] == 2
+        assert diff["delete"] == 1
+        assert diff["insert"] == ["yakaungana"]
+    asyncio.run(run())
+
+def test_edit_matches_stateless_tokenize():
+    async def run():
+        session = IncrementalTokenizer(processor, remove_punctuation=False, remove_stopwords=True)
+        tokens = apply_diff([], await session.append("Vana vaitamba panze na baba."))
+        # Join two words by deleting the space between them, then split one
+        tokens = apply_diff(tokens, await session.edit(4, 5, ""))
+        tokens = apply_diff(tokens, await session.edit(20, 20, " 123 na"))
+        expected = await processor.tokenize(session.text, remove_punctuation=False, remove_stopwords=True)
+        assert session.tokens == tokens == expected
+    asyncio.run(run())
+
+def test_edit_rejects_invalid_range():
+    async def run():
+        session = IncrementalTokenizer(processor)
+        await session.append("Mhuri yese")
+        with pytest.raises(ValueError):
+            await session.edit(5, 20, "x")
+    asyncio.run(run())
+
+def test_edits_in_middle_of_long_document():
+    async def run():
+        session = IncrementalTokenizer(processor, block_size=64, segment_size=16)
+        tokens = []
+        for _ in range(200):
+            tokens = apply_diff(tokens, await session.append("Mhuri yese yakaungana pamba. "))
+        assert len(session.blocks) > 1
+        for position in (session.length // 2, 70, session.length - 100):
+            tokens = apply_diff(tokens, await session.edit(position, position + 7, " vana vaitamba "))
+        # Join the words on both sides of a block boundary
+        boundary = len(session.blocks[0].text)
+        tokens = apply_diff(tokens, await session.edit(boundary - 1, boundary, ""))
+        expected = await processor.tokenize(session.text)
+        assert session.tokens == tokens == expected
+        for block in session.blocks[:-1]:
+            assert len(block.text) < 2 * 64 and block.text[-1].isspace()
+            assert sum(length for length, _ in block.segments) == len(block.text)
+    asyncio.run(run())
+
+def test_edit_rejects_text_over_max_length():
+    async def run():
+        session = IncrementalTokenizer(processor, max_length=10)
+        await session.append("Mhuri yese")
+        with pytest.raises(ValueError):
+            await session.append(" yakaungana")
+        assert session.text == "Mhuri yese"
+    asyncio.run(run())
+
+def test_bulk_append_matches_stateless_tokenize():
+    async def run():
+        text = "Mhuri yese yakaungana pamba pavakuru, asi vana vaitamba panze. " * 200
+        session = IncrementalTokenizer(processor, remove_stopwords=True)
+        diff = await session.append(text)
+        expected = await processor.tokenize(text, remove_stopwords=True)
+        assert diff["insert"] == session.tokens == expected
+        assert len(session.blocks) > 1
+    asyncio.run(run())
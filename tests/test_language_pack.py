@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from app.utils import shona_resources
+from app.utils.shona_processor import ShonaTextProcessor
+from app.utils.multilang_processor import MultiLanguageProcessor, PROCESSOR_CLASSES
+from app.utils.language_pack import (
+    HEADER, DIRECTORY_ENTRY, LanguagePack, MappedStringSet, build_language_pack
+)
+
+TEXT = "Mhuri yese yakaungana pamba pavakuru, asi vana vaitamba panze na baba. "
+
+def build_pack(tmp_path):
+    path = tmp_path / "language_pack.bin"
+    build_language_pack(str(path), PROCESSOR_CLASSES)
+    return path
+
+def test_pack_round_trips_resources(tmp_path):
+    resources = LanguagePack(str(build_pack(tmp_path))).get("sn")
+    assert isinstance(resources.stopwords, MappedStringSet)
+    assert resources.special_chars == shona_resources.SPECIAL_CHARS
+    assert set(resources.stopwords) == shona_resources.STOPWORDS
+    assert len(resources.stopwords) == len(shona_resources.STOPWORDS)
+    assert all(term in resources.stopwords for term in shona_resources.STOPWORDS)
+    for term in ("mhuri", "", "nekutii", "zvakadar", 1):
+        assert term not in resources.stopwords
+
+def test_pack_processor_matches_built_in(tmp_path):
+    processor = ShonaTextProcessor()
+    packed = ShonaTextProcessor(LanguagePack(str(build_pack(tmp_path))).get("sn"))
+    for _ in range(2):
+        assert (asyncio.run(packed.tokenize(TEXT, remove_stopwords=True))
+                == asyncio.run(processor.tokenize(TEXT, remove_stopwords=True)))
+
+def test_multilang_processor_uses_pack(tmp_path):
+    processor = MultiLanguageProcessor(language_pack_path=str(build_pack(tmp_path))).processors["sn"]
+    assert isinstance(processor.shona_stopwords, MappedStringSet)
+
+def test_pack_does_not_import_built_in_resources(tmp_path):
+    code = (
+        "import sys\n"
+        "from app.utils.multilang_processor import MultiLanguageProcessor\n"
+        "MultiLanguageProcessor()\n"
+        "assert 'app.utils.shona_resources' not in sys.modules\n"
+    )
+    root = Path(__file__).resolve().parent.parent
+    env = {"LANGUAGE_PACK_PATH": str(build_pack(tmp_path)), "PYTHONPATH": str(root)}
+    subprocess.run([sys.executable, "-c", code], env=env, cwd=root, check=True)
+
+def test_stale_pack_falls_back_to_built_in(tmp_path, caplog):
+    path = build_pack(tmp_path)
+    data = bytearray(path.read_bytes())
+    # Flip the fingerprint, as if the definitions changed after the build
+    data[HEADER.size + DIRECTORY_ENTRY.size - 1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with caplog.at_level(logging.WARNING):
+        processor = MultiLanguageProcessor(language_pack_path=str(path)).processors["sn"]
+    assert processor.shona_stopwords is shona_resources.STOPWORDS
+    assert "stale" in caplog.text
+
+@pytest.mark.parametrize("size", [0, 5, HEADER.size + 10, -20])
+def test_truncated_pack_falls_back_to_built_in(tmp_path, size):
+    path = build_pack(tmp_path)
+    path.write_bytes(path.read_bytes()[:size])
+    with pytest.raises(ValueError):
+        LanguagePack(str(path))
+    processor = MultiLanguageProcessor(language_pack_path=str(path)).processors["sn"]
+    assert processor.shona_stopwords is shona_resources.STOPWORDS
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_pack.bin"
+    path.write_bytes(b"x" * 16)
+    with pytest.raises(ValueError):
+        LanguagePack(str(path))